@@ -10,11 +10,13 @@
 # - Okami API Key auto-load (secrets/env/keyring) + optional inline edit
 # ------------------------------------------------------------
 
-import sys, asyncio, os, json, warnings
+import sys, asyncio, os, json, heapq, html, inspect, queue, threading, time, warnings
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 import streamlit as st
+from importlib.util import find_spec
 
 warnings.filterwarnings(
     "ignore",
@@ -22,16 +24,33 @@ warnings.filterwarnings(
     category=UserWarning
 )
 
-# ---- asyncio (Windows) ----
+# ---- asyncio (Windows policy / uvloop) ----
 try:
     if sys.platform.startswith("win") and hasattr(asyncio, "WindowsSelectorEventLoopPolicy"):
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 except Exception:
     pass
-try:
-    asyncio.get_running_loop()
-except RuntimeError:
-    asyncio.set_event_loop(asyncio.new_event_loop())
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    # POSIX: libuv-backed loop for the script thread when uvloop is installed (Streamlit's own loop untouched)
+    if not sys.platform.startswith("win") and find_spec("uvloop") is not None:
+        import uvloop  # type: ignore
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+@st.cache_resource(show_spinner=False)
+def get_ib_loop() -> asyncio.AbstractEventLoop:
+    # one loop per process: the IB socket is registered on the loop current at Connect
+    return _new_event_loop()
+
+def install_ib_loop() -> None:
+    # full reruns and fragment runs must both drive that same loop (Streamlit may install its own per run)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.set_event_loop(get_ib_loop())
+
+install_ib_loop()
 
 # ---- optional extras ----
 _HAS_AUTO = True
@@ -40,12 +59,20 @@ try:
 except Exception:
     _HAS_AUTO = False
 
-_HAS_ALTAIR = True
+# st.fragment (>=1.37) / st.experimental_fragment (1.33–1.36): partial reruns
+_FRAGMENT = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+# pandas/altair are imported where first used (trades table / chart) to keep cold start light
+_HAS_PANDAS = find_spec("pandas") is not None
+_HAS_ALTAIR = _HAS_PANDAS and find_spec("altair") is not None
+
 try:
-    import pandas as pd
-    import altair as alt
+    # one urllib3 pool + JSON codec (orjson when available) per process, shared with orb_strategy
+    from orb_strategy import _http_pool, _PRICE_KEYS, _json_dumps, _json_loads
 except Exception:
-    _HAS_ALTAIR = False
+    _http_pool = _PRICE_KEYS = None
+    def _json_dumps(obj: Any) -> bytes: return json.dumps(obj).encode("utf-8")
+    _json_loads = json.loads
 
 # ---- ib_insync ----
 try:
@@ -62,13 +89,14 @@ except Exception as e:
     st.exception(e)
 
 from importlib import import_module
+from collections import deque
+from functools import lru_cache
+from operator import attrgetter
 
 # ---- Okami token loader ----
-def get_okami_token_from_sources() -> str:
-    # order: session → secrets.toml → ENV → keyring
-    tok = st.session_state.get("okami_token")
-    if tok:
-        return tok
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_okami_token_cached() -> str:
+    # secrets.toml → ENV → keyring, consulted at most once a minute (keyring can be a slow OS-store call)
     try:
         sec = st.secrets.get("okami", {})
         if isinstance(sec, dict) and sec.get("token"):
@@ -87,27 +115,59 @@ def get_okami_token_from_sources() -> str:
         pass
     return ""
 
-# ---- load strategy helpers (from orb_strategy.py if exists) ----
-OkamiClient = None
-recent_bars_for_chart = None
-autodetect_contract = None
+def get_okami_token_from_sources() -> str:
+    # order: session → secrets.toml → ENV → keyring
+    tok = st.session_state.get("okami_token")
+    if tok:
+        return tok
+    return _load_okami_token_cached()
 
-def load_orb_entrypoint():
-    global OkamiClient, recent_bars_for_chart, autodetect_contract
-    for mod_name in ["strategies.orb", "trade_monitor.orb", "trader_bot", "orb_strategy"]:
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_telegram_defaults() -> Tuple[str, str]:
+    # (bot_token, chat_id) from secrets.toml, else ENV
+    try:
+        if "telegram" in st.secrets:
+            tg = st.secrets.get("telegram", {})
+            return tg.get("bot_token"), tg.get("chat_id")
+    except Exception:
+        pass
+    return os.getenv("TELEGRAM_BOT_TOKEN", ""), os.getenv("TELEGRAM_CHAT_ID", "")
+
+# ---- load strategy helpers (from orb_strategy.py if exists) ----
+@st.cache_resource(show_spinner=False)
+def load_orb_entrypoint() -> Dict[str, Any]:
+    # resolved once per process; returns the helpers too (module globals reset on every rerun)
+    # trader_bot is not probed: it has no run_orb_once and imports pandas/pandas_ta at module scope
+    for mod_name in ["strategies.orb", "trade_monitor.orb", "orb_strategy"]:
         try:
+            if find_spec(mod_name) is None:
+                continue
             mod = import_module(mod_name)
         except Exception:
             continue
         fn = getattr(mod, "run_orb_once", None)
         if callable(fn):
-            OkamiClient = getattr(mod, "OkamiClient", OkamiClient)
-            recent_bars_for_chart = getattr(mod, "recent_bars_for_chart", recent_bars_for_chart)
-            autodetect_contract = getattr(mod, "autodetect_contract", autodetect_contract)
-            return fn, mod_name + ".run_orb_once"
-    return None, None
-
-ORB_ENTRYPOINT, ORB_SOURCE = load_orb_entrypoint()
+            try:
+                params = inspect.signature(fn).parameters.values()
+                accepted = None if any(p.kind is p.VAR_KEYWORD for p in params) else frozenset(p.name for p in params)
+            except (TypeError, ValueError):
+                accepted = None
+            return {
+                "fn": fn, "source": mod_name + ".run_orb_once", "accepted": accepted,
+                "OkamiClient": getattr(mod, "OkamiClient", None),
+                "recent_bars_for_chart": getattr(mod, "recent_bars_for_chart", None),
+                "recent_bars_for_chart_since": getattr(mod, "recent_bars_for_chart_since", None),
+                "autodetect_contract": getattr(mod, "autodetect_contract", None),
+            }
+    return {}
+
+_orb = load_orb_entrypoint()
+ORB_ENTRYPOINT, ORB_SOURCE = _orb.get("fn"), _orb.get("source")
+ORB_ACCEPTED = _orb.get("accepted")  # kwarg names run_orb_once takes (None = anything)
+OkamiClient = _orb.get("OkamiClient")
+recent_bars_for_chart = _orb.get("recent_bars_for_chart")
+recent_bars_for_chart_since = _orb.get("recent_bars_for_chart_since")
+autodetect_contract = _orb.get("autodetect_contract")
 
 @st.cache_resource(show_spinner=False)
 def get_ib_client():
@@ -115,11 +175,67 @@ def get_ib_client():
         return None
     return IB()
 
+@st.cache_resource(show_spinner=False)
+def get_trade_events(_ib) -> Dict[str, int]:
+    # bumped by ib_insync callbacks; sessions re-pull trades only when it moves
+    ev = {"version": 0}
+    def _bump(*_): ev["version"] += 1
+    for name in ("connectedEvent", "newOrderEvent", "orderStatusEvent", "execDetailsEvent"):
+        try:
+            getattr(_ib, name).connect(_bump)
+        except Exception:
+            pass
+    return ev
+
+def trades_version(ib) -> Tuple[int, int]:
+    # event counter + trade count (local list, no IB round-trip) in case an update arrived without an event
+    return get_trade_events(ib)["version"], len(_trades_list(ib))
+
+OPEN_ORDERS_RESYNC_SECS = 30.0
+TRADES_RESUMMARIZE_SECS = 15.0  # backstop: re-summarize even if no order/exec event was seen
+
+def resync_open_orders(ib, now: datetime) -> None:
+    # fire-and-forget reqOpenOrders on ib_insync's loop: the render never waits for TWS;
+    # the replies land as order events and show up on the next tick via trades_version
+    last = st.session_state.get("_open_orders_resync")
+    if last and (now - last).total_seconds() < OPEN_ORDERS_RESYNC_SECS:
+        return
+    st.session_state["_open_orders_resync"] = now
+    task = asyncio.ensure_future(ib.reqOpenOrdersAsync())
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())  # retrieve errors (no "never retrieved" noise)
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    # one keep-alive session for Telegram (no TCP/TLS handshake per call); Okami uses orb_strategy's _http_pool()
+    try:
+        import requests  # type: ignore
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+    except Exception:
+        return None
+    s = requests.Session()
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                    max_retries=Retry(total=1, backoff_factor=0.1)))
+    return s
+
+NY = ZoneInfo("America/New_York")
+
 def now_utc(): return datetime.now(timezone.utc)
+@st.cache_resource(show_spinner=False)
+def _ts_formatter():
+    # lives across reruns (the script body, and any plain lru_cache in it, is re-executed)
+    @lru_cache(maxsize=4096)
+    def _fmt(epoch_sec: int) -> str:
+        return datetime.fromtimestamp(epoch_sec).strftime("%Y-%m-%d %H:%M:%S")
+    return _fmt
+
 def fmt_ts(ts: Optional[datetime]) -> str:
-    return "—" if not ts else ts.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+    return "—" if not ts else _ts_formatter()(int(ts.timestamp()))
 
 # ---- IB trades helpers ----
+_MIN_TS = datetime.min.replace(tzinfo=timezone.utc)
+OPEN_STATUSES = frozenset({"PreSubmitted", "Submitted", "ApiPending", "PendingSubmit", "PendingCancel"})
+
 def _trades_list(ib) -> list:
     try:
         tr = getattr(ib, "trades", None)
@@ -128,72 +244,205 @@ def _trades_list(ib) -> list:
     except Exception: pass
     return []
 
-def snapshot_trades(ib) -> List[Dict[str, Any]]:
-    rows = []
-    for t in _trades_list(ib):
-        c, o, s = getattr(t, "contract", None), getattr(t, "order", None), getattr(t, "orderStatus", None)
-        sym = getattr(c, "localSymbol", None) or getattr(c, "symbol", "—")
-        sec = getattr(c, "secType", "")
-        act = getattr(o, "action", "—")
-        qty = getattr(o, "totalQuantity", "—")
-        filled = getattr(s, "filled", 0.0) if s else 0.0
-        remain = getattr(s, "remaining", 0.0) if s else None
-        avg = getattr(s, "avgFillPrice", None) if s else None
-        status = getattr(s, "status", "—") if s else "—"
-
-        last_fill = None
-        for f in getattr(t, "fills", []):
-            ex = getattr(f, "execution", None)
-            ts = getattr(ex, "time", None) if ex else None
-            if ts and (last_fill is None or ts > last_fill):
-                last_fill = ts
-        rows.append({"time": last_fill, "symbol": sym, "type": sec, "action": act,
-                     "qty": qty, "filled": filled, "remaining": remain, "avg_price": avg, "status": status})
-    rows.sort(key=lambda r: r["time"] or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
-    return rows
-
-def count_open_orders(ib) -> int:
-    open_statuses = {"PreSubmitted", "Submitted", "ApiPending", "PendingSubmit", "PendingCancel"}
-    n = 0
-    for t in _trades_list(ib):
-        s = getattr(getattr(t, "orderStatus", None), "status", "")
-        if s in open_statuses: n += 1
-    return n
+_contract_fields = attrgetter("localSymbol", "symbol", "secType")
+_order_fields = attrgetter("action", "totalQuantity")
+_status_fields = attrgetter("filled", "remaining", "avgFillPrice", "status")
 
-def last_fill_timestamp(rows: List[Dict[str, Any]]) -> Optional[datetime]:
-    for r in rows:
-        if r["time"]: return r["time"]
-    return None
-
-def derive_bot_state(enabled: bool, open_orders: int, last_fill: Optional[datetime]) -> str:
+def _trade_fields(t) -> tuple:
+    # fast path for regular ib_insync Trade objects; getattr walk for partial ones
+    try:
+        lsym, sym, sec = _contract_fields(t.contract)
+        act, qty = _order_fields(t.order)
+        filled, remain, avg, status = _status_fields(t.orderStatus)
+        last_fill = max((f.execution.time for f in t.fills if f.execution and f.execution.time), default=None)
+        return last_fill, (lsym or sym), sec, act, qty, filled, remain, avg, status
+    except AttributeError:
+        pass
+    c, o, s = getattr(t, "contract", None), getattr(t, "order", None), getattr(t, "orderStatus", None)
+    sym = getattr(c, "localSymbol", None) or getattr(c, "symbol", "—")
+    sec = getattr(c, "secType", "")
+    act = getattr(o, "action", "—")
+    qty = getattr(o, "totalQuantity", "—")
+    filled = getattr(s, "filled", 0.0) if s else 0.0
+    remain = getattr(s, "remaining", 0.0) if s else None
+    avg = getattr(s, "avgFillPrice", None) if s else None
+    status = getattr(s, "status", "—") if s else "—"
+    last_fill = max(filter(None, (getattr(getattr(f, "execution", None), "time", None) for f in getattr(t, "fills", ()))),
+                    default=None)
+    return last_fill, sym, sec, act, qty, filled, remain, avg, status
+
+def summarize_trades(ib) -> Tuple[List[Dict[str, Any]], int, Optional[datetime]]:
+    # one pass over ib.trades(): table rows + open-order count + newest fill time
+    rows, open_orders, newest = [], 0, None
+    append = rows.append
+    for t in _trades_list(ib):
+        last_fill, sym, sec, act, qty, filled, remain, avg, status = _trade_fields(t)
+        if status in OPEN_STATUSES: open_orders += 1
+        if last_fill and (newest is None or last_fill > newest):
+            newest = last_fill
+        append({"time": last_fill, "symbol": sym, "type": sec, "action": act,
+                "qty": qty, "filled": filled, "remaining": remain, "avg_price": avg, "status": status})
+    return rows, open_orders, newest
+
+def latest_trades(rows: List[Dict[str, Any]], n: int) -> List[Dict[str, Any]]:
+    # newest-first top-n without sorting the whole list
+    return heapq.nlargest(n, rows, key=lambda r: r["time"] or _MIN_TS)
+
+ORB_TICK_OFF_HOURS_SECS = 60.0   # outside 09:29–16:00 NY (and weekends) there is nothing to build or enter
+ORB_TICK_RTH_SECS = 10.0         # while the range builds / a position is open; breakout watch runs every refresh
+
+def orb_tick_interval(now: datetime, last_result: Optional[Dict[str, Any]] = None) -> float:
+    # minimum seconds between strategy ticks; no floor while a breakout entry is possible
+    ny = now.astimezone(NY)
+    if ny.weekday() >= 5:
+        return ORB_TICK_OFF_HOURS_SECS
+    hm = (ny.hour, ny.minute)
+    if not (9, 29) <= hm < (16, 0):
+        return ORB_TICK_OFF_HOURS_SECS
+    last = last_result if isinstance(last_result, dict) else {}
+    if last.get("phase") == "building" or last.get("status") == "already_in_position_or_open_orders":
+        remaining = (last.get("range") or {}).get("remaining_sec")
+        # don't sleep past the end of the window: the first breakout check must not lag
+        return min(ORB_TICK_RTH_SECS, float(remaining)) if isinstance(remaining, (int, float)) else ORB_TICK_RTH_SECS
+    return 0.0
+
+RECENT_FILL_WINDOW = timedelta(minutes=2)
+
+def derive_bot_state(enabled: bool, open_orders: int, last_fill: Optional[datetime], now: datetime) -> str:
     if enabled and open_orders > 0: return "Placing / Managing"
-    if last_fill and (now_utc() - last_fill <= timedelta(minutes=2)): return "Executed (recent)"
+    if last_fill and (now - last_fill <= RECENT_FILL_WINDOW): return "Executed (recent)"
     if enabled: return "Waiting for signal"
     return "Idle"
 
+TRADE_COLUMNS = {"time": "Time", "symbol": "Symbol", "type": "Type", "action": "Action", "qty": "Qty",
+                 "filled": "Filled", "remaining": "Remaining", "avg_price": "Avg Price", "status": "Status"}
+_CATEGORY_COLUMNS = {"Symbol": "category", "Type": "category", "Action": "category", "Status": "category"}
+
+def trades_frame(rows: List[Dict[str, Any]]):
+    # typed frame for st.dataframe (categoricals → dictionary-encoded Arrow)
+    if not _HAS_PANDAS:
+        return [{TRADE_COLUMNS[k]: (fmt_ts(v) if k == "time" else v) for k, v in r.items()} for r in rows]
+    import pandas as pd
+    cols = {label: [r[k] for r in rows] for k, label in TRADE_COLUMNS.items()}  # column-major, no per-row dicts
+    cols["Time"] = [fmt_ts(t) for t in cols["Time"]]
+    return pd.DataFrame(cols, copy=False).astype(_CATEGORY_COLUMNS)
+
+# ---- chart ----
+CHART_MINUTES = 45
+CHART_DELTA_SECS = 20.0  # 1-min bars: one delta request per ~third of a bar is plenty
+
+def chart_bars(ib, symbol: str, now: datetime) -> list:
+    # session-level 1-min bar buffer; after the first fill only the delta since the last bar is pulled,
+    # and at most every CHART_DELTA_SECS (the buffer is reused in between)
+    buf = st.session_state.get("_bars_buf")
+    fetched_at = st.session_state.get("_bars_buf_at")
+    if buf is None or st.session_state.get("_bars_buf_symbol") != symbol or recent_bars_for_chart_since is None:
+        buf = deque(recent_bars_for_chart(ib, symbol, minutes=CHART_MINUTES), maxlen=CHART_MINUTES)
+    elif fetched_at and (now - fetched_at).total_seconds() < CHART_DELTA_SECS:
+        return list(buf)
+    else:
+        new = recent_bars_for_chart_since(ib, symbol, buf[-1].date if buf else None, minutes=CHART_MINUTES)
+        if new:
+            while buf and buf[-1].date >= new[0].date:
+                buf.pop()  # replace the still-forming last bar
+            buf.extend(new)
+    st.session_state["_bars_buf"], st.session_state["_bars_buf_symbol"] = buf, symbol
+    st.session_state["_bars_buf_at"] = now
+    return list(buf)
+
+@st.cache_resource(show_spinner=False, ttl=60, max_entries=8)
+def build_close_chart(symbol: str, n_bars: int, last_t, last_close, _bars):
+    # rebuilt only when the bar set changes (key: symbol + count + last bar time/close)
+    import numpy as np
+    import pandas as pd
+    import altair as alt
+    df = pd.DataFrame({
+        "t": [b.date for b in _bars],
+        "close": np.fromiter((b.close for b in _bars), dtype="f8", count=n_bars),
+    })
+    return alt.Chart(df).mark_line().encode(x="t:T", y="close:Q").properties(height=220)
+
 # ---- Telegram ----
-def send_telegram(bot_token: str, chat_id: str, text: str) -> bool:
+def send_telegram(bot_token: str, chat_id: str, text: str, session=None) -> bool:
     if not bot_token or not chat_id: return False
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML", "disable_web_page_preview": True}
     try:
-        try:
-            import requests  # type: ignore
-            r = requests.post(url, json=payload, timeout=5)
+        sess = session if session is not None else get_http_session()
+        if sess is not None:
+            r = sess.post(url, data=_json_dumps(payload), headers={"Content-Type": "application/json"}, timeout=5)
             return r.ok
-        except Exception:
+        else:
             import urllib.request, urllib.error
-            req = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+            req = urllib.request.Request(url, data=_json_dumps(payload),
                                          headers={"Content-Type": "application/json"})
             with urllib.request.urlopen(req, timeout=5) as resp:  # noqa: S310
                 return resp.status == 200
     except Exception:
         return False
 
+TG_BATCH_SECS = 2.0     # alerts arriving within this window go out as one message
+TG_MAX_CHARS = 4096     # Telegram sendMessage text limit
+TG_DEDUP_SECS = 300.0   # same entry alert (status, symbol, price) is not re-sent within this window
+
+def _clip_alert(text: str) -> str:
+    # a single alert over the limit is truncated (Telegram rejects it whole); don't cut an HTML entity in half
+    if len(text) <= TG_MAX_CHARS:
+        return text
+    cut = text[:TG_MAX_CHARS - 1]
+    amp = cut.rfind("&")
+    if amp > cut.rfind(";"):
+        cut = cut[:amp]
+    return cut + "…"
+
+def _join_alerts(texts: List[str], sep: str = "\n—\n") -> List[str]:
+    out, cur = [], ""
+    for t in map(_clip_alert, texts):
+        if cur and len(cur) + len(sep) + len(t) > TG_MAX_CHARS:
+            out.append(cur); cur = t
+        else:
+            cur = f"{cur}{sep}{t}" if cur else t
+    if cur: out.append(cur)
+    return out
+
+@st.cache_resource(show_spinner=False)
+def get_telegram_queue() -> "queue.Queue":
+    # alerts are sent by a daemon worker so the render thread never waits on the network
+    q = queue.Queue(maxsize=128)
+    sess = get_http_session()
+    def _worker():
+        while True:
+            batch = [q.get()]
+            time.sleep(TG_BATCH_SECS)  # let a burst (entry + TP/SL) coalesce
+            while True:
+                try: batch.append(q.get_nowait())
+                except queue.Empty: break
+            by_chat: Dict[Tuple[str, str], List[str]] = {}
+            for bot_token, chat_id, text in batch:
+                by_chat.setdefault((bot_token, chat_id), []).append(text)
+            for (bot_token, chat_id), texts in by_chat.items():
+                for msg in _join_alerts(texts):
+                    send_telegram(bot_token, chat_id, msg, session=sess)
+    threading.Thread(target=_worker, name="telegram-alerts", daemon=True).start()
+    return q
+
+def queue_telegram(bot_token: str, chat_id: str, text: str) -> bool:
+    if not bot_token or not chat_id: return False
+    try:
+        get_telegram_queue().put_nowait((bot_token, chat_id, text))
+        return True
+    except queue.Full:
+        return False  # drop rather than block the dashboard
+
 # ---- Session flags ----
 st.session_state.setdefault("suppress_hist_until_rerun", False)  # lock history/chart during round-trip run
 
 # ---- UI ----
+TIMEFRAMES = ("1 min", "5 mins", "15 mins")
+TRADE_DIRECTIONS = ("Long & Short", "Long Only", "Short Only")
+_TIMEFRAME_INDEX = {v: i for i, v in enumerate(TIMEFRAMES)}
+_DIRECTION_INDEX = {v: i for i, v in enumerate(TRADE_DIRECTIONS)}
+
 st.set_page_config(page_title="Live Bot Dashboard", layout="wide")
 st.title("📈 Live Bot Dashboard – מצב מסחר חי")
 if not _HAS_IB: st.stop()
@@ -203,7 +452,7 @@ with st.sidebar:
     refresh_every = st.number_input("קצב רענון (שניות)", 1, 30, 2)
     auto_refresh = st.toggle("רענון אוטומטי", value=True,
                              help='ב־Okami Std מותר כ־60 קריאות בדקה. השאר ≥ 1 שנ׳.')
-    if auto_refresh and not _HAS_AUTO:
+    if auto_refresh and not _HAS_AUTO and _FRAGMENT is None:
         st.info("כדי לאפשר רענון אוטומטי התקן: `pip install streamlit-autorefresh`")
     st.divider()
 
@@ -270,23 +519,25 @@ with st.sidebar:
         "catchup": True, "catchup_window": 30
     })
     cfg = st.session_state["strategy_config"]
-    ticker = st.text_input("Ticker", value=cfg.get("symbol", "VIXY"))
-    timeframe = st.selectbox("Timeframe", ["1 min", "5 mins", "15 mins"], index=0)
-    orb_minutes = st.number_input("ORB Minutes", 1, 60, int(cfg.get("orb_minutes", 5)), 1)
-    sl_pct = st.number_input("Stop Loss (%)", 0.0, 100.0, float(cfg.get("stop_value", 0.50)), 0.1, format="%.2f")
-    tp_pct = st.number_input("Take Profit (%)", 0.0, 100.0, float(cfg.get("tp_value", 2.00)), 0.1, format="%.2f")
-    trade_dir = st.selectbox("Trade Direction", ["Long & Short", "Long Only", "Short Only"], index=0)
-
-    st.markdown("**Filters**")
-    use_regime = st.checkbox("Use Market Regime Filter", value=bool(cfg.get("use_regime_filter", False)))
-    use_vwap   = st.checkbox("Use VWAP Filter",         value=bool(cfg.get("use_vwap_filter", False)))
-    use_vol    = st.checkbox("Use Volume Filter",       value=bool(cfg.get("use_volume_filter", False)))
-
-    st.markdown("---")
-    c1, c2, c3 = st.columns(3)
-    save_btn  = c1.button("💾 Save")
-    start_btn = c2.button("▶️ Start Bot")
-    stop_btn  = c3.button("⏹️ Stop Bot")
+    # one rerun per Save/Start/Stop instead of one per widget edit
+    with st.form("bot_controls"):
+        ticker = st.text_input("Ticker", value=cfg.get("symbol", "VIXY"))
+        timeframe = st.selectbox("Timeframe", TIMEFRAMES, index=_TIMEFRAME_INDEX.get(cfg.get("timeframe"), 0))
+        orb_minutes = st.number_input("ORB Minutes", 1, 60, int(cfg.get("orb_minutes", 5)), 1)
+        sl_pct = st.number_input("Stop Loss (%)", 0.0, 100.0, float(cfg.get("stop_value", 0.50)), 0.1, format="%.2f")
+        tp_pct = st.number_input("Take Profit (%)", 0.0, 100.0, float(cfg.get("tp_value", 2.00)), 0.1, format="%.2f")
+        trade_dir = st.selectbox("Trade Direction", TRADE_DIRECTIONS, index=_DIRECTION_INDEX.get(cfg.get("trade_direction"), 0))
+
+        st.markdown("**Filters**")
+        use_regime = st.checkbox("Use Market Regime Filter", value=bool(cfg.get("use_regime_filter", False)))
+        use_vwap   = st.checkbox("Use VWAP Filter",         value=bool(cfg.get("use_vwap_filter", False)))
+        use_vol    = st.checkbox("Use Volume Filter",       value=bool(cfg.get("use_volume_filter", False)))
+
+        st.markdown("---")
+        c1, c2, c3 = st.columns(3)
+        save_btn  = c1.form_submit_button("💾 Save")
+        start_btn = c2.form_submit_button("▶️ Start Bot")
+        stop_btn  = c3.form_submit_button("⏹️ Stop Bot")
 
     if save_btn or start_btn:
         cfg.update({
@@ -303,14 +554,9 @@ with st.sidebar:
 
     st.divider()
     st.subheader("🔔 Notifications")
-    st.session_state.setdefault(
-        "tg_token",
-        (st.secrets.get("telegram", {}).get("bot_token") if "telegram" in st.secrets else os.getenv("TELEGRAM_BOT_TOKEN", ""))
-    )
-    st.session_state.setdefault(
-        "tg_chat",
-        (st.secrets.get("telegram", {}).get("chat_id") if "telegram" in st.secrets else os.getenv("TELEGRAM_CHAT_ID", ""))
-    )
+    _tg_default_token, _tg_default_chat = _load_telegram_defaults()
+    st.session_state.setdefault("tg_token", _tg_default_token)
+    st.session_state.setdefault("tg_chat", _tg_default_chat)
     tg_enabled = st.toggle("Enable Telegram alerts", value=st.session_state.get("tg_enabled", False))
     tg_token = st.text_input("Bot Token", value=st.session_state["tg_token"], type="password")
     tg_chat  = st.text_input("Chat ID",  value=st.session_state["tg_chat"])
@@ -320,12 +566,18 @@ with st.sidebar:
     st.session_state["tg_enabled"] = tg_enabled; st.session_state["tg_token"] = tg_token; st.session_state["tg_chat"] = tg_chat
 
 # ---- autorefresh ----
-if 'auto_refresh' in locals() and auto_refresh and _HAS_AUTO:
-    st_autorefresh(interval=int(refresh_every) * 1000, key="auto_refresh_key")
+# with fragments only the live panels rerun on the timer; the sidebar reruns on user action
+if _FRAGMENT is not None:
+    live_fragment = _FRAGMENT(run_every=(int(refresh_every) if auto_refresh else None))
+else:
+    live_fragment = lambda fn: fn
+    if 'auto_refresh' in locals() and auto_refresh and _HAS_AUTO:
+        st_autorefresh(interval=int(refresh_every) * 1000, key="auto_refresh_key")
 
 # ---- connect/disconnect ----
 ib = get_ib_client()
 if ib is None: st.error("❌ לא ניתן ליצור חיבור IB."); st.stop()
+get_trade_events(ib)  # hook order/exec events once
 
 if 'connect_btn' in locals() and connect_btn:
     try:
@@ -357,7 +609,7 @@ def run_okami_test(symbol: str, token: str):
         if OkamiClient is not None:
             oc = OkamiClient(token)
             price = oc.realtime_mid(symbol)
-            if price is None:
+            if price is None:  # minute snapshot only on a miss (one Okami call in the common case)
                 snap = oc.minute_snapshot(symbol)
                 price = float(snap["close"]) if snap and isinstance(snap.get("close"), (int, float)) else None
             if price is not None:
@@ -365,26 +617,31 @@ def run_okami_test(symbol: str, token: str):
             else:
                 st.sidebar.warning("Okami מחובר אך לא הוחזר מחיר (בדוק סימול/הודעות מערכת).")
             return
-        import requests  # type: ignore
-        r = requests.post(
-            "https://okamistocks.io/api/quote/real-time",
-            json={"token": token, "ticker": symbol},
-            timeout=5
+        try:
+            pm = _http_pool() if _http_pool is not None else None
+        except ImportError:
+            pm = None
+        if pm is None:
+            st.sidebar.error("urllib3/orb_strategy לא זמינים. התקן: `pip install urllib3`")
+            return
+        r = pm.request(
+            "POST", "https://okamistocks.io/api/quote/real-time",
+            body=_json_dumps({"token": token, "ticker": symbol}),
+            headers={"Content-Type": "application/json"},
+            timeout=5.0
         )
-        if r.ok:
-            js = r.json()
+        if 200 <= r.status < 300:
+            js = _json_loads(r.data)
             price = None
             bid, ask = js.get("bid_price"), js.get("ask_price")
             if isinstance(bid, (int, float)) and isinstance(ask, (int, float)):
                 price = (bid + ask) / 2.0
             else:
-                for fld in ("last", "minute_close_price", "bid_price", "ask_price"):
-                    v = js.get(fld)
-                    if isinstance(v, (int, float)): price = float(v); break
+                price = next((float(v) for v in map(js.get, _PRICE_KEYS) if isinstance(v, (int, float))), None)
             st.sidebar.success(f"Okami OK — {symbol} price: {price}") if price is not None \
                 else st.sidebar.warning("Okami OK אך לא זוהה שדה מחיר.")
         else:
-            st.sidebar.error(f"Okami כשל (HTTP {r.status_code})")
+            st.sidebar.error(f"Okami כשל (HTTP {r.status})")
     except Exception as e:
         st.sidebar.error(f"שגיאת Okami: {e}")
 
@@ -397,12 +654,36 @@ def build_stock_contract(symbol: str):
     sym = symbol.strip().upper()
     try:
         if autodetect_contract:
-            c = autodetect_contract(ib, sym)
+            c = autodetect_contract(ib, sym)  # cached per symbol in orb_strategy, cleared on disconnectedEvent
             return Stock(sym, "SMART", getattr(c, "currency", "USD") or "USD")
     except Exception:
         pass
     return Stock(sym, "SMART", "USD")
 
+def _wait_filled(ib: IB, trade, qty: int, timeout_s: int) -> bool:
+    # resolve a future from the trade's own status/fill events (no polling, no unrelated wake-ups)
+    if getattr(trade.orderStatus, "filled", 0) >= qty:
+        return True
+    if trade.isDone():
+        return False
+    fut = asyncio.get_event_loop().create_future()
+    def _on_update(t, *_):
+        if fut.done():
+            return
+        if getattr(t.orderStatus, "filled", 0) >= qty:
+            fut.set_result(True)
+        elif t.isDone():
+            fut.set_result(False)
+    trade.statusEvent += _on_update
+    trade.fillEvent += _on_update
+    try:
+        return ib.run(asyncio.wait_for(fut, timeout_s))
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        trade.statusEvent -= _on_update
+        trade.fillEvent -= _on_update
+
 def run_tws_round_trip(ib: IB, symbol: str, qty: int = 1, timeout_s: int = 30) -> (bool, str):
     try:
         if not ib.isConnected():
@@ -410,17 +691,11 @@ def run_tws_round_trip(ib: IB, symbol: str, qty: int = 1, timeout_s: int = 30) -
         con = build_stock_contract(symbol)
         buy = MarketOrder("BUY", qty)
         t_buy = ib.placeOrder(con, buy)
-        end = now_utc() + timedelta(seconds=timeout_s)
-        while (now_utc() < end) and (getattr(t_buy.orderStatus, "filled", 0) < qty):
-            ib.sleep(0.25)
-        if getattr(t_buy.orderStatus, "filled", 0) < qty:
+        if not _wait_filled(ib, t_buy, qty, timeout_s):
             return False, "קניה לא מולאה בזמן שהוגדר."
         sell = MarketOrder("SELL", qty)
         t_sell = ib.placeOrder(con, sell)
-        end = now_utc() + timedelta(seconds=timeout_s)
-        while (now_utc() < end) and (getattr(t_sell.orderStatus, "filled", 0) < qty):
-            ib.sleep(0.25)
-        if getattr(t_sell.orderStatus, "filled", 0) < qty:
+        if not _wait_filled(ib, t_sell, qty, timeout_s):
             return False, "מכירה לא מולאה בזמן שהוגדר."
         avg_buy = getattr(t_buy.orderStatus, "avgFillPrice", None)
         avg_sell = getattr(t_sell.orderStatus, "avgFillPrice", None)
@@ -438,163 +713,190 @@ if 'test_tws_btn' in locals() and test_tws_btn:
         (st.sidebar.success if ok else st.sidebar.error)(msg)
         st.session_state["last_tws_result"] = (ok, msg, now_utc())
 
-# ---------- HEADER ----------
-col1, col2, col3, col4 = st.columns([2, 1, 1, 2])
-with col1:
-    if ib.isConnected():
-        st.success(f"IB Ready (orders) ✅  ({host}:{port}, clientId={client_id})")
-    else:
-        st.error("IB לא מחובר ❌")
-
-trade_rows, open_orders, last_fill = [], 0, None
-enabled = bool(st.session_state.get("strategy_enabled", False))
-if ib.isConnected():
-    try:
-        ib.reqOpenOrders(); _ = ib.openTrades(); _ = ib.fills()
-        trade_rows = snapshot_trades(ib); open_orders = count_open_orders(ib); last_fill = last_fill_timestamp(trade_rows)
-    except Exception as e:
-        st.warning(f"שגיאה בשליפת סטטוס טריידים: {e}")
-
-state = derive_bot_state(enabled, open_orders, last_fill)
-with col2: st.metric("סטטוס בוט", state)
-with col3: st.metric("הזמנות פתוחות", open_orders)
-with col4: st.metric("מילוי אחרון", fmt_ts(last_fill))
-
-if "last_tws_result" in st.session_state:
-    ok, msg, t = st.session_state["last_tws_result"]
-    (st.success if ok else st.error)(f"{fmt_ts(t)} · {msg}")
-
-st.divider()
-
-# ---------- BODY ----------
-left, right = st.columns([3, 2])
+# ---------- LIVE (header + body + log; refreshed as a fragment) ----------
+@live_fragment
+def render_live():
+    install_ib_loop()  # fragment reruns skip the module prelude
+    now = now_utc()  # one clock read per render
+    # ---------- HEADER ----------
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 2])
+    with col1:
+        if ib.isConnected():
+            st.success(f"IB Ready (orders) ✅  ({host}:{port}, clientId={client_id})")
+        else:
+            st.error("IB לא מחובר ❌")
 
-with left:
-    st.subheader("🧾 עסקאות אחרונות (IB Trades)")
-    if trade_rows:
-        def row(r): return {"Time": fmt_ts(r["time"]), "Symbol": r["symbol"], "Type": r["type"],
-                            "Action": r["action"], "Qty": r["qty"], "Filled": r["filled"],
-                            "Remaining": r["remaining"], "Avg Price": r["avg_price"], "Status": r["status"]}
-        st.dataframe([row(r) for r in trade_rows], use_container_width=True, height=350)
-    else:
-        st.write("אין טריידים להצגה עדיין.")
-
-with right:
-    st.subheader("📡 ניטור חי")
-    st.write(f"⏱️ עכשיו: **{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}**")
-    st.write("🔗 IB (Orders): **Connected**" if ib.isConnected() else "🔴 IB: **Disconnected**")
-    ds = st.session_state.get("data_source", "okami")
-    st.write(f"🛰️ Data Source: **{ds.upper()}**")
-    if ds == "okami":
-        st.caption("Rate limit (Std): ~60 קריאות/דקה. קצב הרענון ≥ 1 שנ׳.")
-    st.markdown("---")
-    st.subheader("📐 ORB – מצב חי")
-
-# ---------- STRATEGY TICK ----------
-orb_levels, last_price_val, reason_text, phase = None, None, None, None
-decision_status = None
-provider = {}
-
-SUPPRESS_THIS_RUN = bool(st.session_state.get("suppress_hist_until_rerun"))
-
-if (not SUPPRESS_THIS_RUN) and ib.isConnected() and enabled and ORB_ENTRYPOINT is not None:
-    cfg = st.session_state["strategy_config"]
-    symbol = cfg["symbol"]; qty = int(cfg.get("qty", 100))
-    tp = float(cfg["tp_value"]); sl = float(cfg["stop_value"]); orb_min = int(cfg["orb_minutes"])
+    trade_rows, open_orders, last_fill = [], 0, None
+    enabled = bool(st.session_state.get("strategy_enabled", False))
+    if ib.isConnected():
+        try:
+            resync_open_orders(ib, now)
+            ib.sleep(0)  # dispatch pending order/exec callbacks (bumps trade_events)
+            summarized_at = st.session_state.get("_trades_at")
+            if (st.session_state.get("_trades_version") != trades_version(ib) or "_trades_cache" not in st.session_state
+                    or not summarized_at or (now - summarized_at).total_seconds() >= TRADES_RESUMMARIZE_SECS):
+                st.session_state["_trades_cache"] = summarize_trades(ib)
+                st.session_state["_trades_version"] = trades_version(ib)
+                st.session_state["_trades_at"] = now
+            trade_rows, open_orders, last_fill = st.session_state["_trades_cache"]
+        except Exception as e:
+            st.warning(f"שגיאה בשליפת סטטוס טריידים: {e}")
+
+    state = derive_bot_state(enabled, open_orders, last_fill, now)
+    with col2: st.metric("סטטוס בוט", state)
+    with col3: st.metric("הזמנות פתוחות", open_orders)
+    with col4: st.metric("מילוי אחרון", fmt_ts(last_fill))
+
+    if "last_tws_result" in st.session_state:
+        ok, msg, t = st.session_state["last_tws_result"]
+        (st.success if ok else st.error)(f"{fmt_ts(t)} · {msg}")
 
-    kwargs = dict(
-        ib=ib, symbol=symbol, qty=qty, tp_pct=tp, sl_pct=sl,
-        range_minutes=orb_min, buffer_pct=0.0, cache=st.session_state,
-    )
-    if st.session_state["data_source"] == "okami":
-        kwargs.update(data_source="okami",
-                      okami_token=st.session_state.get("okami_token", ""),
-                      hybrid_fill_with_ib=bool(hybrid),
-                      enter_on_late_breakout=True)
-    else:
-        kwargs.update(data_source="ib")
+    st.divider()
 
-    try:
-        result = ORB_ENTRYPOINT(**kwargs)
-        st.session_state["last_strategy_tick"] = now_utc()
-    except TypeError:
-        keep = ("ib","symbol","qty","tp_pct","sl_pct","range_minutes","buffer_pct","cache")
-        result = ORB_ENTRYPOINT(**{k: v for k, v in kwargs.items() if k in keep})
-        st.session_state["last_strategy_tick"] = now_utc()
-    except Exception as e:
-        result = {"status": "error", "reason": str(e)}
-
-    if isinstance(result, dict):
-        decision_status = result.get("status", "")
-        phase = result.get("phase")
-        provider = result.get("provider", {})
-        rng = result.get("range")
-        if rng:
-            orb_levels = {"high": rng.get("high"), "low": rng.get("low"),
-                          "progress": rng.get("progress"), "remaining_sec": rng.get("remaining_sec"),
-                          "complete": rng.get("complete"), "start": rng.get("start"), "end": rng.get("end")}
-        last_price_val = result.get("last")
-        reason_text = result.get("reason")
-
-with right:
-    if st.session_state["data_source"] == "okami":
-        ok = provider.get("ok")
-        ts = provider.get("last_api_ts")
-        if ok:
-            st.success(f"Okami Status: OK  ·  last_ts={ts or '—'}")
+    # ---------- BODY ----------
+    left, right = st.columns([3, 2])
+
+    with left:
+        st.subheader("🧾 עסקאות אחרונות (IB Trades)")
+        if trade_rows:
+            summarized_at = st.session_state.get("_trades_at")
+            if st.session_state.get("_trades_df_at") != summarized_at or "_trades_df" not in st.session_state:
+                st.session_state["_trades_df"] = trades_frame(latest_trades(trade_rows, 350))  # rebuilt once per re-summary
+                st.session_state["_trades_df_at"] = summarized_at
+            st.dataframe(st.session_state["_trades_df"], use_container_width=True, height=350)
+        else:
+            st.write("אין טריידים להצגה עדיין.")
+
+    with right:
+        st.subheader("📡 ניטור חי")
+        st.write(f"⏱️ עכשיו: **{now.astimezone().strftime('%Y-%m-%d %H:%M:%S')}**")
+        st.write("🔗 IB (Orders): **Connected**" if ib.isConnected() else "🔴 IB: **Disconnected**")
+        ds = st.session_state.get("data_source", "okami")
+        st.write(f"🛰️ Data Source: **{ds.upper()}**")
+        if ds == "okami":
+            st.caption("Rate limit (Std): ~60 קריאות/דקה. קצב הרענון ≥ 1 שנ׳.")
+        st.markdown("---")
+        st.subheader("📐 ORB – מצב חי")
+
+    # ---------- STRATEGY TICK ----------
+    orb_levels, last_price_val, reason_text = None, None, None
+    decision_status = None
+    provider = {}
+
+    SUPPRESS_THIS_RUN = bool(st.session_state.get("suppress_hist_until_rerun"))
+
+    if (not SUPPRESS_THIS_RUN) and ib.isConnected() and enabled and ORB_ENTRYPOINT is not None:
+        cfg = st.session_state["strategy_config"]
+        symbol = cfg["symbol"]; qty = int(cfg.get("qty", 100))
+        tp = float(cfg["tp_value"]); sl = float(cfg["stop_value"]); orb_min = int(cfg["orb_minutes"])
+
+        kwargs = dict(
+            ib=ib, symbol=symbol, qty=qty, tp_pct=tp, sl_pct=sl,
+            range_minutes=orb_min, buffer_pct=0.0, cache=st.session_state,
+        )
+        if st.session_state["data_source"] == "okami":
+            kwargs.update(data_source="okami",
+                          okami_token=st.session_state.get("okami_token", ""),
+                          hybrid_fill_with_ib=bool(hybrid),
+                          enter_on_late_breakout=True)
         else:
-            st.warning("Okami Status: לא התקבלה תשובה לאחרונה (ייבדק בטיק הבא).")
-
-    if orb_levels:
-        p = orb_levels.get("progress")
-        rem = orb_levels.get("remaining_sec")
-        compl = orb_levels.get("complete")
-        if compl:
-            st.success("🎯 חלון ה-ORB הסתיים – גבולות סופיים נעולים.")
+            kwargs.update(data_source="ib")
+
+        if ORB_ACCEPTED is not None:
+            kwargs = {k: v for k, v in kwargs.items() if k in ORB_ACCEPTED}
+        tick_key = (symbol, orb_min, st.session_state["data_source"])
+        last_tick = st.session_state.get("last_strategy_tick")
+        cached_key, cached_result = st.session_state.get("last_orb_result", (None, None))
+        fresh = not (cached_key == tick_key and last_tick and
+                     (now - last_tick).total_seconds() < orb_tick_interval(now, cached_result))
+        if not fresh:
+            result = cached_result  # within the tick gap: re-show the last tick instead of hitting Okami/IB again
         else:
-            st.info(f"⏳ בונה טווח ORB — נותר {rem if rem is not None else '?'} שנ׳")
             try:
-                st.progress(min(1.0, max(0.0, float(p))))
-            except Exception:
-                pass
-
-    c1, c2, c3 = st.columns(3)
-    with c1: st.metric("ORB High", f"{(orb_levels or {}).get('high', '—')}")
-    with c2: st.metric("Last Price", f"{last_price_val if last_price_val is not None else '—'}")
-    with c3: st.metric("ORB Low", f"{(orb_levels or {}).get('low', '—')}")
-
-    if decision_status == "building_range":
-        st.info(reason_text or "בונה טווח פתיחה…")
-    elif decision_status in ("waiting_for_breakout", "already_in_position_or_open_orders"):
-        st.warning(reason_text or decision_status)
-    elif decision_status and decision_status.startswith("entered_"):
-        st.success(reason_text or decision_status)
-    elif decision_status == "error":
-        st.error(reason_text or "שגיאה באסטרטגיה")
-    elif decision_status:
-        st.write(decision_status)
-
-    # Chart (disabled when SUPPRESS_THIS_RUN)
-    try:
-        if _HAS_ALTAIR and ib.isConnected() and recent_bars_for_chart and (not SUPPRESS_THIS_RUN):
-            bars = recent_bars_for_chart(ib, st.session_state["strategy_config"]["symbol"], minutes=45)
-            if bars:
-                df = pd.DataFrame([{"t": b.date, "close": float(b.close)} for b in bars])
-                ch = alt.Chart(df).mark_line().encode(x="t:T", y="close:Q").properties(height=220)
-                st.altair_chart(ch, use_container_width=True)
-    except Exception:
-        pass
+                result = ORB_ENTRYPOINT(**kwargs)
+                st.session_state["last_strategy_tick"] = now
+                st.session_state["last_orb_result"] = (tick_key, result)
+            except Exception as e:
+                result = {"status": "error", "reason": str(e)}
+
+        if isinstance(result, dict):
+            decision_status = result.get("status", "")
+            provider = result.get("provider", {})
+            rng = result.get("range")
+            if rng:
+                orb_levels = {"high": rng.get("high"), "low": rng.get("low"),
+                              "progress": rng.get("progress"), "remaining_sec": rng.get("remaining_sec"),
+                              "complete": rng.get("complete"), "start": rng.get("start"), "end": rng.get("end")}
+            last_price_val = result.get("last")
+            reason_text = result.get("reason")
+            alert_key = (decision_status, symbol, round(float(last_price_val or 0), 2))
+            last_key, last_sent = st.session_state.get("_tg_last", (None, None))
+            if (fresh and (decision_status or "").startswith("entered_") and st.session_state.get("tg_enabled")
+                    and not (last_key == alert_key and (now - last_sent).total_seconds() < TG_DEDUP_SECS)):
+                st.session_state["_tg_last"] = (alert_key, now)
+                queue_telegram(st.session_state.get("tg_token", ""), st.session_state.get("tg_chat", ""),
+                               f"🚀 <b>{html.escape(symbol)}</b> {decision_status} @ {last_price_val}\n{html.escape(reason_text or '')}")
+
+    with right:
+        if st.session_state["data_source"] == "okami":
+            ok = provider.get("ok")
+            ts = provider.get("last_api_ts")
+            if ok:
+                st.success(f"Okami Status: OK  ·  last_ts={ts or '—'}")
+            else:
+                st.warning("Okami Status: לא התקבלה תשובה לאחרונה (ייבדק בטיק הבא).")
+
+        if orb_levels:
+            p = orb_levels.get("progress")
+            rem = orb_levels.get("remaining_sec")
+            compl = orb_levels.get("complete")
+            if compl:
+                st.success("🎯 חלון ה-ORB הסתיים – גבולות סופיים נעולים.")
+            else:
+                st.info(f"⏳ בונה טווח ORB — נותר {rem if rem is not None else '?'} שנ׳")
+                try:
+                    st.progress(min(1.0, max(0.0, float(p))))
+                except Exception:
+                    pass
+
+        c1, c2, c3 = st.columns(3)
+        with c1: st.metric("ORB High", f"{(orb_levels or {}).get('high', '—')}")
+        with c2: st.metric("Last Price", f"{last_price_val if last_price_val is not None else '—'}")
+        with c3: st.metric("ORB Low", f"{(orb_levels or {}).get('low', '—')}")
+
+        if decision_status == "building_range":
+            st.info(reason_text or "בונה טווח פתיחה…")
+        elif decision_status in ("waiting_for_breakout", "already_in_position_or_open_orders"):
+            st.warning(reason_text or decision_status)
+        elif decision_status and decision_status.startswith("entered_"):
+            st.success(reason_text or decision_status)
+        elif decision_status == "error":
+            st.error(reason_text or "שגיאה באסטרטגיה")
+        elif decision_status:
+            st.write(decision_status)
+
+        # Chart (disabled when SUPPRESS_THIS_RUN)
+        try:
+            if _HAS_ALTAIR and ib.isConnected() and recent_bars_for_chart and (not SUPPRESS_THIS_RUN):
+                chart_symbol = st.session_state["strategy_config"]["symbol"]
+                bars = chart_bars(ib, chart_symbol, now)
+                if bars:
+                    ch = build_close_chart(chart_symbol, len(bars), bars[-1].date, bars[-1].close, bars)
+                    st.altair_chart(ch, use_container_width=True)
+        except Exception:
+            pass
 
-st.divider()
+    st.divider()
+
+    # ---- LOG ----
+    st.subheader("🪵 יומן אירועים")
+    log_text = "\n".join(
+        f"{fmt_ts(r['time'])} | {r['symbol']:>6} | {r['action']:^4} | qty={r['qty']} | filled={r['filled']} | status={r['status']} | avg={r['avg_price']}"
+        for r in latest_trades(trade_rows, 20)
+    )
+    st.code(log_text or "היומן ריק כרגע.", language="text")
 
-# ---- LOG ----
-st.subheader("🪵 יומן אירועים")
-log_lines = []
-for r in (snapshot_trades(ib) if ib.isConnected() else [])[:20]:
-    when = fmt_ts(r["time"])
-    line = f"{when} | {r['symbol']:>6} | {r['action']:^4} | qty={r['qty']} | filled={r['filled']} | status={r['status']} | avg={r['avg_price']}"
-    log_lines.append(line)
-st.code("\n".join(log_lines) if log_lines else "היומן ריק כרגע.", language="text")
+render_live()
 
 st.caption("© Live Bot Dashboard — Data by OkamiStocks (optional), Orders via IBKR. ORB live builder, reasons, Telegram alerts. • Round-trip uses selected Ticker and is blocked on LIVE if 'Paper only' checked.")
 
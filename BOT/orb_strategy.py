@@ -6,6 +6,7 @@
 # ------------------------------------------------------------
 
 from __future__ import annotations
+import json, weakref
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from typing import Optional, Dict, Any, List
@@ -13,9 +14,31 @@ from typing import Optional, Dict, Any, List
 # IB only for ORDERS (we try not to request market data from IB)
 from ib_insync import IB, Stock, Contract, MarketOrder, LimitOrder, StopOrder, BarData
 
+try:
+    import orjson  # type: ignore  # C-level JSON for the Okami payloads
+
+    def _json_dumps(obj: Any) -> bytes: return orjson.dumps(obj)
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes: return json.dumps(obj).encode("utf-8")
+    _json_loads = json.loads
+
 NY = ZoneInfo("America/New_York")
+OPEN_STATUSES = frozenset({"PreSubmitted", "Submitted", "ApiPending", "PendingSubmit", "PendingCancel"})
+
+# shared keep-alive urllib3 pool (created on first Okami call)
+_HTTP_POOL = None
+
+def _http_pool():
+    global _HTTP_POOL
+    if _HTTP_POOL is None:
+        import urllib3  # type: ignore
+        _HTTP_POOL = urllib3.PoolManager(num_pools=2, maxsize=8, retries=False)
+    return _HTTP_POOL
 
 # ---------------------------- Okami client ----------------------------
+_PRICE_KEYS = ("last", "minute_close_price", "bid_price", "ask_price")  # fallback order when no bid/ask mid
+
 class OkamiClient:
     BASE = "https://okamistocks.io/api"
 
@@ -28,30 +51,32 @@ class OkamiClient:
         data = {"token": self.token, **payload}
         try:
             try:
-                import requests  # type: ignore
-                r = requests.post(f"{self.BASE}{path}", json=data, timeout=5)
-                if r.ok:
+                r = _http_pool().request(
+                    "POST", f"{self.BASE}{path}",
+                    body=_json_dumps(data),
+                    headers={"Content-Type": "application/json", "Accept": "application/json"},
+                    timeout=5.0,
+                )
+                if 200 <= r.status < 300:
+                    js = _json_loads(r.data)
                     self._last_ok = True
                     try:
-                        self._last_ts = r.json().get("timestamp")
+                        self._last_ts = js.get("timestamp")
                     except Exception:
                         pass
-                    return r.json()
+                    return js
                 self._last_ok = False
                 return None
             except Exception:
                 # stdlib fallback
-                import json as _json
                 import urllib.request
                 req = urllib.request.Request(
                     f"{self.BASE}{path}",
-                    data=_json.dumps(data).encode("utf-8"),
+                    data=_json_dumps(data),
                     headers={"Content-Type": "application/json", "Accept": "application/json"},
                 )
                 with urllib.request.urlopen(req, timeout=5) as resp:  # noqa: S310
-                    body = resp.read().decode("utf-8")
-                    import json as _json2
-                    js = _json2.loads(body)
+                    js = _json_loads(resp.read())
                     self._last_ok = True
                     self._last_ts = js.get("timestamp")
                     return js
@@ -72,11 +97,7 @@ class OkamiClient:
         ask = js.get("ask_price")
         if isinstance(bid, (int, float)) and isinstance(ask, (int, float)) and bid == bid and ask == ask:
             return float((bid + ask) / 2.0)
-        for fld in ("last", "minute_close_price", "bid_price", "ask_price"):
-            v = js.get(fld)
-            if isinstance(v, (int, float)) and v == v:
-                return float(v)
-        return None
+        return next((float(v) for v in map(js.get, _PRICE_KEYS) if isinstance(v, (int, float)) and v == v), None)
 
     def minute_snapshot(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
@@ -101,18 +122,30 @@ class OkamiClient:
 
 
 # ------------------------- IB contract helper -------------------------
+# symbol -> resolved contract; qualifyContracts is an IB round-trip, so do it once per connection
+_CONTRACT_CACHE: Dict[str, Contract] = {}
+_CACHE_HOOKED_IBS: weakref.WeakSet = weakref.WeakSet()  # by object, not id(): ids are reused after GC
+
 def autodetect_contract(ib: IB, symbol: str) -> Contract:
     symbol = symbol.strip().upper()
     con = Stock(symbol, "SMART", "USD")
     if not ib or not ib.isConnected():
         return con
+    hit = _CONTRACT_CACHE.get(symbol)
+    if hit is not None:
+        return hit
     try:
         q = ib.qualifyContracts(con)[0]
         ex = getattr(q, "primaryExchange", None) or getattr(q, "exchange", None) or "SMART"
         cur = getattr(q, "currency", "USD") or "USD"
-        return Stock(symbol, ex, cur)
+        resolved = Stock(symbol, ex, cur)
     except Exception:
         return con
+    if ib not in _CACHE_HOOKED_IBS:
+        ib.disconnectedEvent += _CONTRACT_CACHE.clear
+        _CACHE_HOOKED_IBS.add(ib)
+    _CONTRACT_CACHE[symbol] = resolved
+    return resolved
 
 
 # --------- IB historical bars (used only if hybrid catch-up is enabled) ---------
@@ -127,6 +160,19 @@ def _bars_today_1min_ib(ib: IB, contract: Contract) -> List[BarData]:
         keepUpToDate=False,
     ) or []
 
+def _last_close_1min_ib(ib: IB, contract: Contract) -> Optional[float]:
+    # last 1min close only (a couple of bars instead of the whole day)
+    bars = ib.reqHistoricalData(
+        contract,
+        endDateTime="",
+        durationStr="120 S",
+        barSizeSetting="1 min",
+        whatToShow="TRADES",
+        useRTH=True,
+        keepUpToDate=False,
+    ) or []
+    return float(bars[-1].close) if bars else None
+
 
 # ---------------------------- ORB calculators ----------------------------
 def _orb_window_today(range_minutes: int) -> Dict[str, Any]:
@@ -145,8 +191,7 @@ def _compute_range_from_bars(bars: List[BarData], start: datetime, end: datetime
             continue
         if bt.tzinfo is None:
             bt = bt.replace(tzinfo=NY)
-        bt_ny = bt.astimezone(NY)
-        if start <= bt_ny < end:
+        if start <= bt < end:  # aware datetimes compare across zones
             hi = b.high if hi is None else max(hi, b.high)
             lo = b.low  if lo is None else min(lo, b.low)
     if hi is None or lo is None:
@@ -217,7 +262,7 @@ def open_orders_count(ib: IB, contract: Contract) -> int:
         for t in ib.openTrades():
             if t.contract.conId == contract.conId:
                 st = (t.orderStatus and t.orderStatus.status) or ""
-                if st in {"PreSubmitted", "Submitted", "ApiPending", "PendingSubmit", "PendingCancel"}:
+                if st in OPEN_STATUSES:
                     c += 1
     except Exception:
         pass
@@ -331,11 +376,25 @@ def run_orb_once(
                     rng["low"]  = from_ib["low"]  if rng["low"]  is None else min(rng["low"],  from_ib["low"])
 
     else:  # "ib" as data source (legacy)
-        bars = _bars_today_1min_ib(ib, contract)
-        rng = _compute_range_from_bars(bars, start, min(now_ny, end))
-        # last price approx from last bar (no streaming)
-        if bars:
-            last_price = float(bars[-1].close)  # last 1min close
+        # הטווח סופי אחרי סוף החלון – נשמר ב-cache ולא נמשך שוב יום שלם של ברים בכל טיק
+        key = f"ib_orb_{symbol}_{start.date().isoformat()}_{range_minutes}"
+        rng = cache.get(key)
+        if rng is not None:
+            rng = dict(rng)
+            last_price = _last_close_1min_ib(ib, contract)
+            if last_price is None:
+                # outside RTH / quiet symbol: the short window is empty, fall back to today's last close
+                bars = _bars_today_1min_ib(ib, contract)
+                if bars:
+                    last_price = float(bars[-1].close)
+        else:
+            bars = _bars_today_1min_ib(ib, contract)
+            rng = _compute_range_from_bars(bars, start, min(now_ny, end))
+            if rng and now_ny >= end + timedelta(minutes=1):  # grace minute: the last in-window bar may still be partial
+                cache[key] = dict(rng)
+            # last price approx from last bar (no streaming)
+            if bars:
+                last_price = float(bars[-1].close)  # last 1min close
         provider_info["ok"] = ib.isConnected()
 
     # --------- phases ---------
@@ -486,3 +545,24 @@ def recent_bars_for_chart(ib: IB, symbol: str, minutes: int = 45) -> List[BarDat
         ) or []
     except Exception:
         return []
+
+def recent_bars_for_chart_since(ib: IB, symbol: str, since: Optional[datetime], minutes: int = 45) -> List[BarData]:
+    """
+    דלתא לגרף: רק ברים מ-since (כולל, כדי לרענן בר אחרון שעדיין נבנה).
+    since=None → כל החלון (כמו recent_bars_for_chart).
+    """
+    if since is None:
+        return recent_bars_for_chart(ib, symbol, minutes)
+    try:
+        now = datetime.now(since.tzinfo) if since.tzinfo else datetime.now()
+        secs = max(60, int((now - since).total_seconds()) + 60)
+        if secs >= max(5, int(minutes)) * 60:
+            return recent_bars_for_chart(ib, symbol, minutes)
+        con = autodetect_contract(ib, symbol)
+        bars = ib.reqHistoricalData(
+            con, endDateTime="", durationStr=f"{secs} S",
+            barSizeSetting="1 min", whatToShow="TRADES", useRTH=True, keepUpToDate=False
+        ) or []
+        return [b for b in bars if b.date >= since]
+    except Exception:
+        return []
@@ -5,6 +5,12 @@ import streamlit as st
 from sqlalchemy import create_engine, text
 from monitor_settings import SQLITE_PATH, DASH_REFRESH_SECS
 
+_HAS_AUTO = True
+try:
+    from streamlit_autorefresh import st_autorefresh
+except Exception:
+    _HAS_AUTO = False
+
 st.set_page_config(page_title="Live Trade Monitor", layout="wide")
 st.title("📈 Live Trade Monitor — Why did (or didn’t) we trade?")
 
@@ -149,7 +155,10 @@ try:
 except Exception as e:
     st.warning(f"Chart error: {e}")
 
-# Auto refresh loop
+# Auto refresh (browser-side timer; falls back to a blocking sleep+rerun if the component is missing)
 if auto:
-    time.sleep(float(refresh))
-    st.rerun()
+    if _HAS_AUTO:
+        st_autorefresh(interval=int(float(refresh) * 1000), key="monitor_autorefresh")
+    else:
+        time.sleep(float(refresh))
+        st.rerun()